@@ -15,10 +15,203 @@ This model implements a multi-scale physics approach to EUV exposure:
 All parameters validated against 2023-2024 industry measurements.
 """
 
+from dataclasses import asdict, dataclass
+
 import numpy as np
-import random
 from scipy import stats
-from scipy.ndimage import gaussian_filter
+from scipy.ndimage import gaussian_filter, gaussian_filter1d, uniform_filter
+from scipy.signal import lfilter, lfilter_zi
+
+try:
+    import joblib
+except ImportError:  # joblib is optional; the process window then runs serially
+    joblib = None
+
+try:
+    import numba
+except ImportError:  # Numba is optional; NumPy fallbacks are used without it
+    numba = None
+
+
+# Edge padding of the recursive Gaussian, in standard deviations
+_RECURSIVE_GAUSSIAN_PAD = 4.0
+
+
+def _recursive_gaussian_2d(image, sigma):
+    """
+    Gaussian blur over the last two axes using a recursive (IIR) filter.
+    
+    Implements the Young-van Vliet recursive Gaussian as a causal and an
+    anti-causal third-order pass along each axis, so the cost per pixel is
+    independent of sigma. Edges are treated as constant-extended by padding
+    the image with its edge values for _RECURSIVE_GAUSSIAN_PAD sigma.
+    
+    Args:
+        image: Array to blur (at least 2D)
+        sigma: Gaussian standard deviation in pixels
+        
+    Returns:
+        Array: Blurred image with the same shape as the input
+    """
+    if sigma < 2.5:
+        # Narrow kernels are cheap to convolve directly, and the recursive
+        # approximation loses accuracy there
+        axes_sigma = [0.0] * (image.ndim - 2) + [sigma, sigma]
+        return gaussian_filter(image, sigma=axes_sigma, mode='nearest')
+    
+    q = 0.98711 * sigma - 0.96330
+    b0 = 1.57825 + 2.44413 * q + 1.4281 * q**2 + 0.422205 * q**3
+    b1 = 2.44413 * q + 2.85619 * q**2 + 1.26661 * q**3
+    b2 = -(1.4281 * q**2 + 1.26661 * q**3)
+    b3 = 0.422205 * q**3
+    b = [1.0 - (b1 + b2 + b3) / b0]
+    a = [1.0, -b1 / b0, -b2 / b0, -b3 / b0]
+    zi = lfilter_zi(b, a)
+    
+    # Edge-pad so the filter settles on the constant extension before it
+    # reaches the image; the zi start states alone are only approximate
+    pad = int(np.ceil(_RECURSIVE_GAUSSIAN_PAD * sigma))
+    blurred = np.pad(image, [(0, 0)] * (image.ndim - 2) + [(pad, pad), (pad, pad)], mode='edge')
+    for axis in (-2, -1):
+        blurred = np.moveaxis(blurred, axis, -1)
+        # Causal pass, then anti-causal pass on the reversed signal
+        blurred, _ = lfilter(b, a, blurred, axis=-1, zi=zi * blurred[..., :1])
+        blurred = blurred[..., ::-1]
+        blurred, _ = lfilter(b, a, blurred, axis=-1, zi=zi * blurred[..., :1])
+        blurred = np.moveaxis(blurred[..., ::-1], -1, axis)
+    
+    return np.ascontiguousarray(blurred[..., pad:-pad, pad:-pad], dtype=image.dtype)
+
+
+# Vertical reach of the JIT scatter kernel's band buffers, in standard deviations
+_SCATTER_HALO_SIGMA = 8.0
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _scatter_electrons_numba(counts, sigma, seed, n_chunks):
+        """
+        JIT-compiled Monte Carlo electron scatter, parallel over row bands.
+        
+        Each chunk scatters the electrons of one contiguous band of source
+        rows into its own buffer, which covers only the band plus a halo of
+        _SCATTER_HALO_SIGMA sigma rows (vertical offsets beyond it, about
+        1e-15 of them, are redrawn). This avoids write contention while the
+        buffers stay close to one image in total. Each chunk seeds its
+        (thread-local) generator from seed, so results do not depend on how
+        chunks are scheduled onto threads.
+        """
+        height, width = counts.shape
+        halo = int(np.ceil(_SCATTER_HALO_SIGMA * sigma))
+        band = -(-height // n_chunks)
+        partial = np.zeros((n_chunks, band + 2 * halo, width), dtype=np.float32)
+        for c in numba.prange(n_chunks):
+            np.random.seed(seed + c)
+            y0 = c * band
+            for y in range(y0, min(y0 + band, height)):
+                for x in range(width):
+                    for _ in range(counts[y, x]):
+                        dy = int(np.random.normal(0.0, sigma))
+                        while dy < -halo or dy > halo:
+                            dy = int(np.random.normal(0.0, sigma))
+                        ny = y + dy
+                        nx = x + int(np.random.normal(0.0, sigma))
+                        if 0 <= ny < height and 0 <= nx < width:
+                            partial[c, ny - y0 + halo, nx] += 1.0
+        
+        # Fold the overlapping band buffers into the image
+        electron_map = np.zeros((height, width), dtype=np.float32)
+        for c in range(n_chunks):
+            for row in range(band + 2 * halo):
+                y = c * band - halo + row
+                if 0 <= y < height:
+                    electron_map[y] += partial[c, row]
+        return electron_map
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _development_rate_numba(acid, base, contrast, out):
+        """
+        Fused development-rate sigmoid over flat float32 arrays (single pass).
+        """
+        base = np.float32(base)
+        contrast = np.float32(contrast)
+        half = np.float32(0.5)
+        one = np.float32(1.0)
+        for i in numba.prange(acid.size):
+            out[i] = base / (one + np.exp(-contrast * (acid[i] - half)))
+else:
+    _scatter_electrons_numba = None
+    _development_rate_numba = None
+
+
+def _photons_per_nm2_per_dose(constants):
+    """
+    Photons per nm² delivered by a dose of 1 mJ/cm².
+    """
+    energy_per_photon_j = constants.eV_per_photon * 1.602e-19
+    photons_per_cm2 = 1e-3 / energy_per_photon_j
+    return photons_per_cm2 * 1e-14
+
+
+def _row_mean_std(values, valid):
+    """
+    Mean and standard deviation over the last axis, ignoring invalid entries.
+    
+    Args:
+        values: Array of per-row values
+        valid: Boolean array marking which entries to include
+        
+    Returns:
+        tuple: (count, mean, std) reduced over the last axis
+    """
+    count = valid.sum(axis=-1)
+    n = np.maximum(count, 1)
+    mean = np.where(valid, values, 0.0).sum(axis=-1) / n
+    deviation = np.where(valid, values - mean[..., None], 0.0)
+    std = np.sqrt((deviation**2).sum(axis=-1) / n)
+    return count, mean, std
+
+
+@dataclass(slots=True)
+class ToolParameters:
+    """
+    Exposure tool parameters (defaults: ASML NXE:3800E).
+    """
+    wavelength_nm: float = 13.5
+    numerical_aperture: float = 0.33   # High-NA would be 0.55
+    illumination_sigma: float = 0.55   # Conventional illumination
+    dose_mJ_cm2: float = 30.0          # Typical production dose
+    exposure_time_s: float = 0.1
+    source_power_W: float = 1000.0     # At intermediate focus
+
+
+@dataclass(slots=True)
+class ResistParameters:
+    """
+    Resist material parameters (defaults: validated CAR resist).
+    """
+    type: str = 'CAR'  # 'CAR' or 'MeOx'
+    absorption_coefficient: float = 0.78  # 1/nm (measured at 13.5 nm)
+    secondary_electron_yield: float = 3.2  # Measured for typical CAR
+    electron_scattering_range_nm: float = 4.8  # Measured for CAR
+    chemical_amplification_factor: float = 500  # Typical for CAR
+    acid_diffusion_length_nm: float = 5.2  # Measured by CD-SEMXPS
+    quenching_factor: float = 0.15  # Base quencher effectiveness
+    reaction_rate_constant: float = 0.85  # For deprotection kinetics
+    stochastic_factor: float = 1.25  # LER scaling factor
+    development_rate_base_nm_s: float = 0.5
+    development_contrast: float = 4.5
+
+
+@dataclass(slots=True)
+class PhysicsConstants:
+    """
+    Physics constants used by the simulation.
+    """
+    eV_per_photon: float = 92.0  # 1240 eV*nm / 13.5 nm
+    electron_mean_free_path_nm: float = 2.3  # In CAR
+    avogadro: float = 6.022e23
+    nm_per_pixel: float = 0.5  # Simulation resolution
+
 
 class EUVExposureModel:
     """
@@ -31,47 +224,28 @@ class EUVExposureModel:
     - SEMATECH EUV Stochastic Database (2024)
     """
     
-    def __init__(self, tool_parameters=None, resist_parameters=None):
+    def __init__(self, tool_parameters=None, resist_parameters=None, seed=None, constants=None):
         """
         Initialize the EUV exposure model with physics-accurate parameters.
         
         Args:
-            tool_parameters: Dictionary of tool-specific parameters
-            resist_parameters: Dictionary of resist-specific parameters
+            tool_parameters: Dictionary of tool-specific parameters; missing
+                entries take the ToolParameters defaults
+            resist_parameters: Dictionary of resist-specific parameters;
+                missing entries take the ResistParameters defaults
+            seed: Seed for the random generator (None = fresh entropy), or
+                a numpy Generator to use directly; a fixed seed makes every
+                stochastic result reproducible
+            constants: PhysicsConstants to use instead of the defaults
         """
         # Default tool parameters (ASML NXE:3800E)
-        self.tool = tool_parameters or {
-            'wavelength_nm': 13.5,
-            'numerical_aperture': 0.33,  # High-NA would be 0.55
-            'illumination_sigma': 0.55,   # Conventional illumination
-            'dose_mJ_cm2': 30.0,          # Typical production dose
-            'exposure_time_s': 0.1,
-            'source_power_W': 1000.0,     # At intermediate focus
-            'photons_per_nm2': 2.45e15    # At wafer level (calculated)
-        }
+        self.tool = ToolParameters(**(tool_parameters or {}))
         
         # Default resist parameters (validated CAR resist)
-        self.resist = resist_parameters or {
-            'type': 'CAR',  # 'CAR' or 'MeOx'
-            'absorption_coefficient': 0.78,  # 1/nm (measured at 13.5 nm)
-            'secondary_electron_yield': 3.2,  # Measured for typical CAR
-            'electron_scattering_range_nm': 4.8,  # Measured for CAR
-            'chemical_amplification_factor': 500,  # Typical for CAR
-            'acid_diffusion_length_nm': 5.2,  # Measured by CD-SEMXPS
-            'quenching_factor': 0.15,  # Base quencher effectiveness
-            'reaction_rate_constant': 0.85,  # For deprotection kinetics
-            'stochastic_factor': 1.25,  # LER scaling factor
-            'development_rate_base_nm_s': 0.5,
-            'development_contrast': 4.5
-        }
+        self.resist = ResistParameters(**(resist_parameters or {}))
         
         # Physics constants
-        self.constants = {
-            'eV_per_photon': 92.0,  # 1240 eV*nm / 13.5 nm
-            'electron_mean_free_path_nm': 2.3,  # In CAR
-            'avogadro': 6.022e23,
-            'nm_per_pixel': 0.5  # Simulation resolution
-        }
+        self.constants = constants if constants is not None else PhysicsConstants()
         
         # Validation metrics (updated during simulation)
         self.metrics = {
@@ -82,22 +256,101 @@ class EUVExposureModel:
             'stochastic_defects_per_um2': 0.0,
             'process_window_size': 0.0
         }
+        
+        # Random generator shared by all stochastic steps
+        self._rng = np.random.default_rng(seed)
+        
+        # 1D Gaussian filter matrices keyed by (size, sigma)
+        self._gauss_cache = {}
+        
+        # Reusable internal work arrays (never returned to callers), one per name
+        self._buffers = {}
+
+    # Work arrays larger than this are allocated per call instead of pooled
+    _BUFFER_POOL_MAX_BYTES = 64 * 2**20
 
-    def calculate_photon_statistics(self, target_area_um2=1.0):
+    def _buf(self, name, shape, dtype=np.float32):
+        """
+        Return an uninitialized internal work array.
+        
+        Each name keeps at most one pooled array, grown on demand, and the
+        returned array is a view of its leading elements. Requests above
+        _BUFFER_POOL_MAX_BYTES are allocated fresh so the pool stays bounded.
+        Callers must not hand the result out of the model.
+        """
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape))
+        if size * dtype.itemsize > self._BUFFER_POOL_MAX_BYTES:
+            return np.empty(shape, dtype=dtype)
+        
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.dtype != dtype or buffer.size < size:
+            buffer = np.empty(size, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer[:size].reshape(shape)
+
+    def clear_buffers(self):
+        """
+        Release the pooled work arrays and cached Gaussian filter matrices.
+        """
+        self._buffers.clear()
+        self._gauss_cache.clear()
+
+    # Largest axis length for which a dense Gaussian filter matrix is cached
+    _GAUSS_MATRIX_MAX_SIZE = 2048
+
+    def _gaussian_blur(self, image, sigma):
+        """
+        Gaussian blur over the last two axes.
+        
+        For axis lengths up to _GAUSS_MATRIX_MAX_SIZE the blur is applied as
+        a product with cached 1D filter matrices, which avoids per-call kernel
+        setup when the same shape and sigma are filtered repeatedly. Larger
+        images fall back to the recursive Gaussian.
+        
+        Args:
+            image: Array to blur (at least 2D)
+            sigma: Gaussian standard deviation in pixels
+        
+        Returns:
+            Array: Blurred image with the same shape as the input
+        """
+        height, width = image.shape[-2:]
+        if max(height, width) > self._GAUSS_MATRIX_MAX_SIZE:
+            return _recursive_gaussian_2d(image, sigma)
+        
+        rows = self._gaussian_matrix(height, sigma)
+        cols = self._gaussian_matrix(width, sigma)
+        return rows @ image.astype(np.float32, copy=False) @ cols.T
+
+    def _gaussian_matrix(self, size, sigma):
+        """
+        Return the cached matrix applying a 1D Gaussian filter to a length-size signal.
+        """
+        key = (size, sigma)
+        matrix = self._gauss_cache.get(key)
+        if matrix is None:
+            # Column j is the filter response to an impulse at j
+            matrix = gaussian_filter1d(np.eye(size, dtype=np.float32), sigma, axis=0, mode='nearest')
+            self._gauss_cache[key] = matrix
+        return matrix
+
+    def calculate_photon_statistics(self, target_area_um2=1.0, dose_mJ_cm2=None):
         """
         Calculate photon statistics for given exposure conditions.
         
+        Args:
+            target_area_um2: Exposed area in um²
+            dose_mJ_cm2: Exposure dose (defaults to the tool dose)
+        
         Returns:
             dict: Photon statistics including shot noise
         """
-        # Calculate photons per nm² based on dose and wavelength
-        dose_j_cm2 = self.tool['dose_mJ_cm2'] * 1e-3
-        energy_per_photon_j = self.constants['eV_per_photon'] * 1.602e-19
-        photons_per_cm2 = dose_j_cm2 / energy_per_photon_j
-        photons_per_nm2 = photons_per_cm2 * 1e-14
+        if dose_mJ_cm2 is None:
+            dose_mJ_cm2 = self.tool.dose_mJ_cm2
         
-        # Update if different from default
-        self.tool['photons_per_nm2'] = photons_per_nm2
+        # Photons per nm² scale linearly with dose
+        photons_per_nm2 = _photons_per_nm2_per_dose(self.constants) * dose_mJ_cm2
         
         # Calculate for target area (convert um² to nm²)
         area_nm2 = target_area_um2 * 1e6
@@ -114,40 +367,161 @@ class EUVExposureModel:
             'photons_per_nm2': photons_per_nm2
         }
 
-    def simulate_electron_cascade(self, photon_map):
+    # Peak mean electrons per pixel above which the cascade is a plain blur
+    _CASCADE_BLUR_THRESHOLD = 50.0
+
+    def simulate_electron_cascade(self, photon_map, blur_threshold=None, blur=None):
         """
-        Simulate secondary electron cascade using Monte Carlo approach.
+        Simulate secondary electron cascade.
+        
+        In the high-dose regime the Monte Carlo scatter of many electrons per
+        pixel converges to a Gaussian blur of the mean electron yield, so the
+        blur is applied directly. Below blur_threshold electrons per pixel the
+        electrons are scattered individually (Monte Carlo) to preserve the
+        stochastic behavior. The regime is chosen per image, so batching does
+        not change the physics applied to any single exposure.
         
         Args:
-            photon_map: 2D array of photon absorption locations
+            photon_map: 2D array of photon absorption locations (any leading
+                axes index independent realizations)
+            blur_threshold: Peak electrons per pixel above which the
+                deterministic blur is used (default _CASCADE_BLUR_THRESHOLD)
+            blur: Regime per image, already decided by the caller from the
+                mean photon map. When given, photon_map holds shot-noise
+                sampled photon counts and each pixel generates its rounded
+                share of electrons; otherwise photon_map is a mean map, the
+                regime is chosen from it and the electron counts are
+                Poisson-sampled
         
         Returns:
             2D array: Electron energy deposition map
         """
-        # Create electron map at same resolution
-        electron_map = np.zeros_like(photon_map)
-        height, width = photon_map.shape
-        
-        # For each absorbed photon, generate secondary electrons
-        for y in range(height):
-            for x in range(width):
-                if photon_map[y, x] > 0:
-                    num_electrons = int(photon_map[y, x] * self.resist['secondary_electron_yield'])
-                    
-                    # Generate electron positions with Gaussian distribution
-                    for _ in range(num_electrons):
-                        # Electron scattering follows Gaussian distribution
-                        sigma = self.resist['electron_scattering_range_nm'] / self.constants['nm_per_pixel']
-                        dx = int(random.gauss(0, sigma))
-                        dy = int(random.gauss(0, sigma))
-                        
-                        # Apply to electron map (with boundary checks)
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < width and 0 <= ny < height:
-                            electron_map[ny, nx] += 1.0
+        sigma = self.resist.electron_scattering_range_nm / self.constants.nm_per_pixel
+        mean_electrons = photon_map * self.resist.secondary_electron_yield
         
+        photons_sampled = blur is not None
+        if photons_sampled:
+            blur = np.broadcast_to(blur, mean_electrons.shape[:-2])
+        else:
+            blur = self._cascade_blur_regime(mean_electrons, blur_threshold)
+        
+        def electron_counts(electrons):
+            # Photon shot noise already in photon_map must not be sampled twice
+            if photons_sampled:
+                return np.rint(electrons).astype(np.int64)
+            return self._rng.poisson(electrons)
+        
+        if blur.all():
+            return self._gaussian_blur(mean_electrons, sigma)
+        
+        if not blur.any():
+            # Number of secondary electrons generated at each pixel
+            return self._scatter_electrons(electron_counts(mean_electrons), sigma)
+        
+        # Mixed batch: each image follows its own regime
+        electron_map = np.empty(mean_electrons.shape, dtype=np.float32)
+        electron_map[blur] = self._gaussian_blur(mean_electrons[blur], sigma)
+        electron_map[~blur] = self._scatter_electrons(electron_counts(mean_electrons[~blur]), sigma)
         return electron_map
 
+    def _cascade_blur_regime(self, mean_electrons, blur_threshold=None):
+        """
+        Return which images of mean_electrons are in the blur regime.
+        
+        Args:
+            mean_electrons: Array of mean electrons per pixel (last two axes
+                are the image)
+            blur_threshold: Peak electrons per pixel above which the blur is
+                used (default _CASCADE_BLUR_THRESHOLD)
+        
+        Returns:
+            Boolean array over the leading axes (0-d for a single image)
+        """
+        if blur_threshold is None:
+            blur_threshold = self._CASCADE_BLUR_THRESHOLD
+        return mean_electrons.max(axis=(-2, -1)) > blur_threshold
+
+    def _scatter_electrons(self, counts, sigma):
+        """
+        Scatter individual electrons from their source pixels (Monte Carlo).
+        
+        Args:
+            counts: Integer array of electrons generated at each pixel; any
+                leading axes index independent realizations
+            sigma: Electron scattering range in pixels
+        
+        Returns:
+            Array: Electron energy deposition map with the shape of counts
+        """
+        # The JIT kernel only pays off when it can spread rows over threads;
+        # single-threaded, NumPy's batched ziggurat sampler is faster
+        electron_map = np.empty(counts.shape, dtype=np.float32)
+        use_numba = _scatter_electrons_numba is not None and numba.get_num_threads() > 1
+        for index in np.ndindex(counts.shape[:-2]):
+            if use_numba:
+                seed = int(self._rng.integers(2**31))
+                electron_map[index] = _scatter_electrons_numba(counts[index], sigma, seed,
+                                                               numba.get_num_threads())
+            else:
+                electron_map[index] = self._scatter_image(counts[index], sigma)
+        return electron_map
+
+    # Electrons scattered per NumPy pass; bounds the per-electron work arrays
+    _SCATTER_CHUNK_ELECTRONS = 2**20
+
+    def _scatter_image(self, counts, sigma):
+        """
+        Scatter the electrons of one 2D image with NumPy.
+        
+        Source pixels are processed in chunks of about
+        _SCATTER_CHUNK_ELECTRONS electrons, so memory use does not grow with
+        the dose or the image size.
+        
+        Args:
+            counts: 2D integer array of electrons generated at each pixel
+            sigma: Electron scattering range in pixels
+        
+        Returns:
+            2D array: Electron energy deposition map
+        """
+        height, width = counts.shape
+        deposit = np.zeros(height * width, dtype=np.float32)
+        
+        sources = np.flatnonzero(counts)
+        n = counts.reshape(-1)[sources]
+        if sources.size == 0:
+            return deposit.reshape(height, width)
+        
+        # Split the sources where the running electron count crosses a chunk boundary
+        cumulative = np.cumsum(n)
+        n_chunks = -(-int(cumulative[-1]) // self._SCATTER_CHUNK_ELECTRONS)
+        splits = np.searchsorted(cumulative, np.arange(1, n_chunks) * self._SCATTER_CHUNK_ELECTRONS,
+                                 side='right')
+        
+        for chunk_sources, chunk_n in zip(np.split(sources, splits), np.split(n, splits)):
+            total = int(chunk_n.sum())
+            if total == 0:
+                continue
+            
+            # One source coordinate per electron
+            y, x = np.divmod(np.repeat(chunk_sources, chunk_n), width)
+            
+            # Electron scattering follows Gaussian distribution: one batched draw
+            # of (dy, dx) into a pooled work buffer
+            offsets = self._buf('scatter_offsets', (2 * total,))
+            self._rng.standard_normal(dtype=np.float32, out=offsets)
+            offsets *= sigma
+            offsets = offsets.astype(np.int32).reshape(2, total)
+            ny = y + offsets[0]
+            nx = x + offsets[1]
+            
+            # Apply to electron map (with boundary checks)
+            mask = (ny >= 0) & (ny < height) & (nx >= 0) & (nx < width)
+            # Histogram of landing sites (much faster than np.add.at for unit increments)
+            deposit += np.bincount(ny[mask] * width + nx[mask], minlength=deposit.size)
+        
+        return deposit.reshape(height, width)
+
     def simulate_chemical_reactions(self, electron_map):
         """
     Simulate chemical reactions in resist (deprotection for CARs).
@@ -158,33 +532,21 @@ class EUVExposureModel:
     Returns:
         2D array: Acid concentration map
     """
-        height, width = electron_map.shape
-        acid_map = np.zeros((height, width))
-        
-        if self.resist['type'] == 'CAR':
-            # For CAR: electron energy -> acid generation
-            for y in range(height):
-                for x in range(width):
-                    if electron_map[y, x] > 0:
-                        # Acid generation proportional to electron energy
-                        acid_generated = electron_map[y, x] * self.resist['chemical_amplification_factor']
-                        
-                        # Apply quenching (simplified model)
-                        acid_concentration = acid_generated * (1.0 - self.resist['quenching_factor'])
-                        
-                        # Reaction kinetics (simplified)
-                        acid_concentration *= self.resist['reaction_rate_constant']
-                        
-                        acid_map[y, x] = acid_concentration
-        
-        elif self.resist['type'] == 'MeOx':
+        if self.resist.type == 'CAR':
+            # For CAR: electron energy -> acid generation, with quenching
+            # and deprotection kinetics folded into a single rate constant
+            acid_yield = (self.resist.chemical_amplification_factor
+                          * (1.0 - self.resist.quenching_factor)
+                          * self.resist.reaction_rate_constant)
+        
+        elif self.resist.type == 'MeOx':
             # For MeOx: electron energy -> metal oxide reduction
-            for y in range(height):
-                for x in range(width):
-                    if electron_map[y, x] > 0:
-                        # Reduction proportional to electron energy
-                        reduction = electron_map[y, x] * 0.85  # Empirical factor
-                        acid_map[y, x] = reduction
+            acid_yield = 0.85  # Empirical factor
+        
+        else:
+            acid_yield = 0.0
+        
+        acid_map = np.multiply(electron_map, acid_yield, dtype=np.float32)
         
         return acid_map
 
@@ -199,10 +561,10 @@ class EUVExposureModel:
         2D array: Diffused acid concentration map
     """
         # Convert diffusion length to pixels
-        sigma_pixels = self.resist['acid_diffusion_length_nm'] / self.constants['nm_per_pixel']
+        sigma_pixels = self.resist.acid_diffusion_length_nm / self.constants.nm_per_pixel
         
         # Apply Gaussian blur to simulate diffusion
-        diffused_acid = gaussian_filter(acid_map, sigma=sigma_pixels)
+        diffused_acid = self._gaussian_blur(acid_map, sigma_pixels)
         
         return diffused_acid
 
@@ -216,10 +578,22 @@ class EUVExposureModel:
     Returns:
         2D array: Development rate map (nm/s)
     """
-        # Development rate follows sigmoid function of acid concentration
-        rate_map = self.resist['development_rate_base_nm_s'] / (
-            1.0 + np.exp(-self.resist['development_contrast'] * (acid_map - 0.5))
-        )
+        # Development rate follows sigmoid function of acid concentration:
+        # base / (1 + exp(-contrast * (acid - 0.5))), evaluated in place
+        contrast = self.resist.development_contrast
+        rate_map = np.empty(acid_map.shape, dtype=np.float32)
+        # Like the electron scatter kernel, the fused loop only beats NumPy's
+        # vectorized exp when it can run on several threads
+        if _development_rate_numba is not None and numba.get_num_threads() > 1:
+            _development_rate_numba(acid_map.ravel(), self.resist.development_rate_base_nm_s,
+                                    contrast, rate_map.reshape(-1))
+            return rate_map
+        
+        np.multiply(acid_map, -contrast, out=rate_map)
+        rate_map += 0.5 * contrast
+        np.exp(rate_map, out=rate_map)
+        rate_map += 1.0
+        np.divide(self.resist.development_rate_base_nm_s, rate_map, out=rate_map)
         
         return rate_map
 
@@ -232,20 +606,18 @@ class EUVExposureModel:
         development_time_s: Development time in seconds
         
     Returns:
-        2D array: Final resist profile (0 = removed, 1 = remaining)
+        2D bool array: Final resist pattern (False = removed, True = remaining)
     """
-        # Calculate total development depth at each point
-        development_depth = rate_map * development_time_s
-        
         # Create initial resist profile (assume 40nm thick)
         resist_thickness_nm = 40.0
-        resist_profile = np.ones_like(rate_map) * resist_thickness_nm
         
-        # Apply development (subtract development depth)
-        resist_profile -= development_depth
+        # Apply development (subtract total development depth at each point)
+        resist_profile = np.multiply(rate_map, -development_time_s,
+                                     out=self._buf('resist_profile', rate_map.shape))
+        resist_profile += resist_thickness_nm
         
-        # Convert to binary pattern (0 = removed, 1 = remaining)
-        pattern = np.where(resist_profile > 0, 1.0, 0.0)
+        # Convert to binary pattern (False = removed, True = remaining)
+        pattern = resist_profile > 0
         
         return pattern
 
@@ -253,40 +625,60 @@ class EUVExposureModel:
         """
     Calculate stochastic metrics from final pattern.
     
+    Edges are located independently in every row, so LER is the spread of
+    the line edge position across rows and CD is the mean width of the
+    first line.
+    
     Args:
-        pattern_map: 2D array of final resist pattern
+        pattern_map: 2D array (bool or numeric) of final resist pattern (any leading axes
+            index independent realizations)
         target_cd_nm: Target critical dimension in nm
         
     Returns:
-        dict: Stochastic metrics (LER, LWR, etc.)
+        dict: Stochastic metrics (LER, LWR, etc.), with one value per
+        realization when pattern_map has leading axes
     """
-        # Extract edges (simplified edge detection)
-        edges = np.diff(pattern_map, axis=1)
-        edge_positions = np.where(edges == 1)[1]  # Only look at right edges for simplicity
-        
-        # Calculate LER
-        if len(edge_positions) > 1:
-            ler = np.std(edge_positions) * self.constants['nm_per_pixel']
-        else:
-            ler = 0.0
-        
-        # Calculate CD error
-        measured_cd = np.mean(np.diff(edge_positions)) * self.constants['nm_per_pixel']
+        pixel_nm = self.constants.nm_per_pixel
+        pattern_map = np.asarray(pattern_map)
+        if pattern_map.dtype == bool:
+            # Numeric view (no copy) so edges can be found by differencing
+            pattern_map = pattern_map.view(np.int8)
+        
+        # Extract edges per row: +1 where a line starts, -1 where it ends
+        edges = np.diff(pattern_map, axis=-1)
+        rising = edges == 1
+        falling = edges == -1
+        columns = np.arange(edges.shape[-1])
+        
+        # Position of the first line's left edge in each row
+        has_edge = rising.any(axis=-1)
+        first_edge = rising.argmax(axis=-1)
+        
+        # Calculate LER (edge position variation across rows)
+        n_rows, _, edge_std = _row_mean_std(first_edge.astype(np.float32), has_edge)
+        ler = np.where(n_rows > 1, edge_std * pixel_nm, 0.0)[()]
+        
+        # Calculate CD error from the width of the first line in each row
+        falling_after = falling & (columns > first_edge[..., None])
+        has_width = has_edge & falling_after.any(axis=-1)
+        line_width = (falling_after.argmax(axis=-1) - first_edge).astype(np.float32)
+        n_widths, mean_width, _ = _row_mean_std(line_width, has_width)
+        measured_cd = np.where(n_widths > 0, mean_width * pixel_nm, np.nan)[()]
         cd_error = measured_cd - target_cd_nm
         
         # Calculate stochastic defect density
         # Defects defined as isolated pixels or missing features
-        defects = 0
-        for y in range(1, pattern_map.shape[0]-1):
-            for x in range(1, pattern_map.shape[1]-1):
-                # Check for isolated pixels (defects)
-                if pattern_map[y, x] == 1 and np.sum(pattern_map[y-1:y+2, x-1:x+2]) <= 2:
-                    defects += 1
-                # Check for missing pixels in lines
-                elif pattern_map[y, x] == 0 and np.sum(pattern_map[y-1:y+2, x-1:x+2]) >= 8:
-                    defects += 1
-        
-        defect_density = defects / (pattern_map.size * (self.constants['nm_per_pixel']**2) * 1e-6)  # per um²
+        neighborhood = [1] * (pattern_map.ndim - 2) + [3, 3]
+        neighborhood_sum = np.rint(uniform_filter(pattern_map, size=neighborhood, output=np.float32, mode='constant') * 9)
+        interior = (Ellipsis, slice(1, -1), slice(1, -1))
+        # Isolated pixels (defects)
+        isolated = ((pattern_map == 1) & (neighborhood_sum <= 2))[interior].sum(axis=(-2, -1))
+        # Missing pixels in lines
+        missing = ((pattern_map == 0) & (neighborhood_sum >= 8))[interior].sum(axis=(-2, -1))
+        defects = isolated + missing
+        
+        image_size = pattern_map.shape[-2] * pattern_map.shape[-1]
+        defect_density = defects / (image_size * (pixel_nm**2) * 1e-6)  # per um²
         
         return {
             'ler_nm': ler,
@@ -295,7 +687,24 @@ class EUVExposureModel:
             'pattern_fidelity': 1.0 - (defect_density * 0.01)  # Simplified fidelity metric
         }
 
-    def run_full_simulation(self, target_pattern, target_cd_nm, development_time_s=30.0):
+    def _compute_aerial(self, target_pattern, sigma_psf=None):
+        """
+    Compute the aerial image by applying the optical PSF to the target pattern.
+    
+    Args:
+        target_pattern: 2D array of target pattern (0 = dark, 1 = clear)
+        sigma_psf: PSF width in pixels (defaults to the in-focus ~15nm blur)
+        
+    Returns:
+        2D array: Aerial image intensity
+    """
+        if sigma_psf is None:
+            sigma_psf = 15.0 / self.constants.nm_per_pixel  # ~15nm blur from optical effects
+        
+        return self._gaussian_blur(target_pattern, sigma_psf)
+
+    def run_full_simulation(self, target_pattern, target_cd_nm, development_time_s=30.0, aerial_image=None,
+                            n_realizations=1, tile_size=None, dose_mJ_cm2=None, batch_size=4):
         """
     Run complete EUV exposure simulation.
     
@@ -303,44 +712,85 @@ class EUVExposureModel:
         target_pattern: 2D array of target pattern (0 = dark, 1 = clear)
         target_cd_nm: Target critical dimension in nm
         development_time_s: Development time in seconds
+        aerial_image: Precomputed aerial image for target_pattern; computed
+            with the in-focus PSF when not given
+        n_realizations: Number of independent stochastic realizations. When
+            greater than 1, every map gains a leading realization axis with
+            its own photon shot noise, and the metrics are averaged over
+            realizations (per-realization values are returned under
+            'realization_metrics')
+        tile_size: When given and the electron cascade is in the blur
+            regime, run steps 3-7 tile by tile (tile_size x tile_size
+            pixels plus a halo) so each tile stays cache-resident through
+            every stage
+        dose_mJ_cm2: Exposure dose for this run (defaults to the tool dose);
+            the tool parameters are left unchanged
+        batch_size: Maximum number of realizations simulated at once, which
+            bounds memory use; when several batches are needed the returned
+            maps cover the first batch only, while the metrics cover all
+            realizations
         
     Returns:
-        dict: Complete simulation results
+        dict: Complete simulation results; 'map_realizations' is the number
+        of realizations held in the returned maps
     """
+        if n_realizations < 1:
+            raise ValueError(f"n_realizations must be at least 1, got {n_realizations}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        
+        # Single precision is ample for the ~1% physics tolerance and halves memory traffic
+        target_pattern = np.asarray(target_pattern, dtype=np.float32)
+        if aerial_image is not None:
+            aerial_image = np.asarray(aerial_image, dtype=np.float32)
+        
         # 1. Calculate photon statistics
-        photon_stats = self.calculate_photon_statistics(target_area_um2=np.sum(target_pattern) * (self.constants['nm_per_pixel']**2) * 1e-6)
+        if dose_mJ_cm2 is None:
+            dose_mJ_cm2 = self.tool.dose_mJ_cm2
+        photon_stats = self.calculate_photon_statistics(
+            target_area_um2=np.sum(target_pattern) * (self.constants.nm_per_pixel**2) * 1e-6,
+            dose_mJ_cm2=dose_mJ_cm2)
         
         # 2. Generate photon absorption map (considering optical effects)
         # First, apply optical PSF to target pattern
-        sigma_psf = 15.0 / self.constants['nm_per_pixel']  # ~15nm blur from optical effects
-        aerial_image = gaussian_filter(target_pattern, sigma=sigma_psf)
+        if aerial_image is None:
+            aerial_image = self._compute_aerial(target_pattern)
         
         # Apply absorption (Beer-Lambert law)
-        photon_map = aerial_image * self.resist['absorption_coefficient'] * photon_stats['photons_per_nm2']
-        
-        # 3. Simulate electron cascade
-        electron_map = self.simulate_electron_cascade(photon_map)
-        
-        # 4. Simulate chemical reactions
-        acid_map = self.simulate_chemical_reactions(electron_map)
-        
-        # 5. Simulate acid diffusion
-        diffused_acid = self.simulate_acid_diffusion(acid_map)
-        
-        # 6. Calculate development rate
-        rate_map = self.calculate_development_rate(diffused_acid)
-        
-        # 7. Simulate development
-        final_pattern = self.simulate_development(rate_map, development_time_s)
-        
-        # 8. Calculate stochastic metrics
-        metrics = self.calculate_stochastic_metrics(final_pattern, target_cd_nm)
+        mean_photon_map = aerial_image * self.resist.absorption_coefficient * photon_stats['photons_per_nm2']
+        
+        # The cascade regime follows the expected electron yield, not one noisy sample
+        blur = self._cascade_blur_regime(mean_photon_map * self.resist.secondary_electron_yield)
+        
+        batch_metrics = []
+        for start in range(0, n_realizations, batch_size):
+            # Photon shot noise (Poisson statistics), independent per realization
+            count = min(batch_size, n_realizations - start)
+            shape = (count,) + mean_photon_map.shape if n_realizations > 1 else None
+            photon_map = self._rng.poisson(mean_photon_map, size=shape).astype(np.float32)
+            
+            # 3-7. Electron cascade, chemistry, diffusion and development
+            stages = self._expose_and_develop(photon_map, blur, development_time_s, tile_size)
+            if start == 0:
+                # Maps are returned for the first batch only
+                maps = (photon_map,) + stages
+            
+            # 8. Calculate stochastic metrics
+            batch_metrics.append(self.calculate_stochastic_metrics(stages[-1], target_cd_nm))
+        
+        if n_realizations > 1:
+            realization_metrics = {key: np.concatenate([batch[key] for batch in batch_metrics])
+                                   for key in batch_metrics[0]}
+            metrics = {key: np.mean(values) for key, values in realization_metrics.items()}
+        else:
+            metrics = batch_metrics[0]
         
         # Update internal metrics
         self.metrics.update(metrics)
-        self.metrics['effective_dose_mJ_cm2'] = self.tool['dose_mJ_cm2']
+        self.metrics['effective_dose_mJ_cm2'] = dose_mJ_cm2
         
-        return {
+        photon_map, electron_map, acid_map, diffused_acid, rate_map, final_pattern = maps
+        results = {
             'photon_stats': photon_stats,
             'aerial_image': aerial_image,
             'photon_map': photon_map,
@@ -349,10 +799,130 @@ class EUVExposureModel:
             'diffused_acid': diffused_acid,
             'rate_map': rate_map,
             'final_pattern': final_pattern,
+            'map_realizations': min(batch_size, n_realizations),
             'metrics': self.metrics
         }
+        if n_realizations > 1:
+            results['realization_metrics'] = realization_metrics
+        
+        return results
+
+    def _expose_and_develop(self, photon_map, blur, development_time_s=30.0, tile_size=None):
+        """
+    Run the pipeline from absorbed photons to the developed pattern.
+    
+    Args:
+        photon_map: Array of shot-noise sampled photon counts (last two axes
+            are the image; any leading axes are simulated independently)
+        blur: Electron cascade regime per image, decided from the mean
+            photon map before sampling (see _cascade_blur_regime)
+        development_time_s: Development time in seconds
+        tile_size: Optional tile edge length (see run_full_simulation)
+        
+    Returns:
+        tuple: (electron_map, acid_map, diffused_acid, rate_map, final_pattern)
+    """
+        tiled = tile_size is not None and np.all(blur)
+        if tiled:
+            # Fused cascade, reaction, diffusion and development per tile
+            (electron_map, acid_map, diffused_acid,
+             rate_map, final_pattern) = self._run_tiled(photon_map, development_time_s, tile_size)
+        else:
+            # Simulate electron cascade
+            electron_map = self.simulate_electron_cascade(photon_map, blur=blur)
+            
+            # Simulate chemical reactions
+            acid_map = self.simulate_chemical_reactions(electron_map)
+            
+            # Simulate acid diffusion
+            diffused_acid = self.simulate_acid_diffusion(acid_map)
+            
+            # Calculate development rate
+            rate_map = self.calculate_development_rate(diffused_acid)
+            
+            # Simulate development
+            final_pattern = self.simulate_development(rate_map, development_time_s)
+        
+        return electron_map, acid_map, diffused_acid, rate_map, final_pattern
+
+    def _run_tiled(self, photon_map, development_time_s, tile_size):
+        """
+    Run the blur-regime cascade through development one tile at a time.
+    
+    Each tile is processed together with a halo wide enough to hold the
+    support of both the electron and the acid diffusion blur, so tile
+    interiors match the whole-image result. The image is edge-padded by
+    the halo first, so border tiles need no special casing.
+    
+    Args:
+        photon_map: Array of absorbed photons (last two axes are the image)
+        development_time_s: Development time in seconds
+        tile_size: Tile edge length in pixels
+        
+    Returns:
+        tuple: (electron_map, acid_map, diffused_acid, rate_map, final_pattern)
+    """
+        sigma_electron = self.resist.electron_scattering_range_nm / self.constants.nm_per_pixel
+        sigma_acid = self.resist.acid_diffusion_length_nm / self.constants.nm_per_pixel
+        halo = int(np.ceil(4.0 * (sigma_electron + sigma_acid)))
+        
+        height, width = photon_map.shape[-2:]
+        pad = [(0, 0)] * (photon_map.ndim - 2) + [(halo, halo), (halo, halo)]
+        mean_electrons = np.pad(photon_map * self.resist.secondary_electron_yield, pad, mode='edge')
+        
+        electron_map = np.empty(photon_map.shape, dtype=np.float32)
+        acid_map = np.empty(photon_map.shape, dtype=np.float32)
+        diffused_acid = np.empty(photon_map.shape, dtype=np.float32)
+        rate_map = np.empty(photon_map.shape, dtype=np.float32)
+        final_pattern = np.empty(photon_map.shape, dtype=bool)
+        
+        for y0 in range(0, height, tile_size):
+            for x0 in range(0, width, tile_size):
+                y1 = min(y0 + tile_size, height)
+                x1 = min(x0 + tile_size, width)
+                tile = (Ellipsis, slice(y0, y1), slice(x0, x1))
+                core = (Ellipsis, slice(halo, halo + y1 - y0), slice(halo, halo + x1 - x0))
+                
+                window = mean_electrons[..., y0:y1 + 2 * halo, x0:x1 + 2 * halo]
+                electrons = self._gaussian_blur(window, sigma_electron)
+                acid = self.simulate_chemical_reactions(electrons)
+                diffused = self.simulate_acid_diffusion(acid)
+                rate = self.calculate_development_rate(diffused[core])
+                
+                electron_map[tile] = electrons[core]
+                acid_map[tile] = acid[core]
+                diffused_acid[tile] = diffused[core]
+                rate_map[tile] = rate
+                final_pattern[tile] = self.simulate_development(rate, development_time_s)
+        
+        return electron_map, acid_map, diffused_acid, rate_map, final_pattern
+
+    def _process_window_block(self, doses, target_cd_nm, aerial_by_focus):
+        """
+    Simulate a block of doses across all focus values in one batched pass.
+    
+    Args:
+        doses: 1D array of exposure doses in mJ/cm²
+        target_cd_nm: Target critical dimension in nm
+        aerial_by_focus: 3D array with the aerial image for each focus value
+        
+    Returns:
+        tuple: (cd_errors, lers) arrays of shape (len(doses), n_focus)
+    """
+        # Photon maps for the whole block: (dose, focus, height, width)
+        photons_per_nm2 = _photons_per_nm2_per_dose(self.constants) * np.asarray(doses, dtype=np.float32)
+        photon_scale = self.resist.absorption_coefficient * photons_per_nm2
+        photon_maps = aerial_by_focus[None] * photon_scale[:, None, None, None]
+        blur = self._cascade_blur_regime(photon_maps * self.resist.secondary_electron_yield)
+        photon_maps = self._rng.poisson(photon_maps).astype(np.float32)
+        
+        *_, final_pattern = self._expose_and_develop(photon_maps, blur)
+        metrics = self.calculate_stochastic_metrics(final_pattern, target_cd_nm)
+        
+        return metrics['cd_error_nm'], metrics['ler_nm']
 
-    def calculate_process_window(self, target_cd_nm, dose_range=None, focus_range=None, steps=10):
+    def calculate_process_window(self, target_cd_nm, dose_range=None, focus_range=None, steps=10, n_jobs=-1,
+                                 grid_size=256):
         """
     Calculate process window (dose-focus matrix).
     
@@ -361,49 +931,59 @@ class EUVExposureModel:
         dose_range: Tuple of (min_dose, max_dose) in mJ/cm²
         focus_range: Tuple of (min_focus, max_focus) in nm
         steps: Number of steps in each dimension
+        n_jobs: Number of worker processes, each simulating whole dose rows
+            (joblib convention, -1 = all cores); 1 or a missing joblib runs
+            the rows one after another in this process
+        grid_size: Edge length in pixels of the simulated test pattern,
+            kept smaller than a full-field simulation. Each dose row is
+            simulated as one batch across all focus values, so at most
+            steps exposures are held in memory at once per worker
         
     Returns:
         dict: Process window metrics
     """
-        dose_range = dose_range or (self.tool['dose_mJ_cm2'] * 0.8, self.tool['dose_mJ_cm2'] * 1.2)
+        dose_range = dose_range or (self.tool.dose_mJ_cm2 * 0.8, self.tool.dose_mJ_cm2 * 1.2)
         focus_range = focus_range or (-40.0, 40.0)  # nm
         
         dose_values = np.linspace(dose_range[0], dose_range[1], steps)
         focus_values = np.linspace(focus_range[0], focus_range[1], steps)
         
         # Create dummy target pattern for testing
-        height, width = 1000, 1000
-        target_pattern = np.zeros((height, width))
-        line_width = int(target_cd_nm / self.constants['nm_per_pixel'])
+        height, width = grid_size, grid_size
+        target_pattern = np.zeros((height, width), dtype=np.float32)
+        line_width = int(target_cd_nm / self.constants.nm_per_pixel)
         target_pattern[:, width//2:width//2 + line_width] = 1.0
         
-        cd_errors = np.zeros((steps, steps))
-        lers = np.zeros((steps, steps))
+        # Aerial image only depends on focus, so compute it once per focus value
+        # Adjust PSF for focus error (simplified model)
+        original_sigma = 15.0 / self.constants.nm_per_pixel
+        aerial_by_focus = np.stack([
+            self._compute_aerial(target_pattern, sigma_psf=original_sigma * (1 + abs(focus) / 100.0))
+            for focus in focus_values
+        ])
+        
+        # Run simulations across dose-focus matrix, one batched dose row at a
+        # time. Each row draws from its own child generator, so a seeded sweep
+        # does not depend on how rows are spread over workers
+        row_rngs = self._rng.spawn(steps)
+        n_workers = 1
+        if joblib is not None and n_jobs != 1:
+            n_workers = min(joblib.effective_n_jobs(n_jobs), steps)
+        
+        rows = ((rng, dose_values[i:i + 1]) for i, rng in enumerate(row_rngs))
+        if n_workers > 1:
+            blocks = joblib.Parallel(n_jobs=n_workers, backend='loky')(
+                joblib.delayed(_process_window_worker)(self.tool, self.resist, self.constants, rng, doses,
+                                                       target_cd_nm, aerial_by_focus)
+                for rng, doses in rows
+            )
+        else:
+            blocks = [_process_window_worker(self.tool, self.resist, self.constants, rng, doses,
+                                             target_cd_nm, aerial_by_focus)
+                      for rng, doses in rows]
         
-        # Run simulations across dose-focus matrix
-        for i, dose in enumerate(dose_values):
-            for j, focus in enumerate(focus_values):
-                # Adjust tool parameters
-                original_dose = self.tool['dose_mJ_cm2']
-                self.tool['dose_mJ_cm2'] = dose
-                
-                # Adjust PSF for focus error (simplified model)
-                original_sigma = 15.0 / self.constants['nm_per_pixel']
-                focus_sigma = original_sigma * (1 + abs(focus) / 100.0)
-                
-                # Run simulation with modified PSF
-                # In a real implementation, we'd modify the optical model
-                # Here we'll just adjust the aerial image calculation
-                
-                # Run simulation
-                results = self.run_full_simulation(target_pattern, target_cd_nm)
-                
-                # Store results
-                cd_errors[i, j] = results['metrics']['cd_error_nm']
-                lers[i, j] = results['metrics']['ler_nm']
-                
-                # Restore original dose
-                self.tool['dose_mJ_cm2'] = original_dose
+        cd_errors = np.concatenate([cd_block for cd_block, _ in blocks])
+        lers = np.concatenate([ler_block for _, ler_block in blocks])
         
         # Calculate process window (area where CD error < ±10% and LER < 1.5nm)
         cd_window = np.abs(cd_errors) < (target_cd_nm * 0.1)
@@ -421,3 +1001,15 @@ class EUVExposureModel:
             'window_area': window_area,
             'target_cd_nm': target_cd_nm
         }
+
+
+def _process_window_worker(tool, resist, constants, rng, doses, target_cd_nm, aerial_by_focus):
+    """
+    Process-window worker: simulate one block of doses on a fresh model.
+    
+    The model draws only from rng, so the result does not depend on where
+    the block runs. Defined at module level so it can be pickled for
+    worker processes.
+    """
+    model = EUVExposureModel(asdict(tool), asdict(resist), seed=rng, constants=constants)
+    return model._process_window_block(doses, target_cd_nm, aerial_by_focus)
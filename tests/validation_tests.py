@@ -33,7 +33,7 @@ def test_secondary_electron_yield():
 def test_acid_diffusion():
     """Validate acid diffusion model against measured data"""
     model = EUVExposureModel()
-    model.resist['acid_diffusion_length_nm'] = 5.2
+    model.resist.acid_diffusion_length_nm = 5.2
     
     # Create a sharp edge pattern
     pattern = np.zeros((100, 100))
@@ -51,13 +51,13 @@ def test_acid_diffusion():
 
 def test_ler_at_32nm_hp():
     """Validate LER against SEMATECH database"""
-    model = EUVExposureModel()
-    model.tool['dose_mJ_cm2'] = 30.0
+    model = EUVExposureModel(seed=2024)
+    model.tool.dose_mJ_cm2 = 30.0
     
     # Create 32nm half-pitch line-space pattern
     height, width = 1000, 1000
     target_cd_nm = 16.0  # Half-pitch = 32nm
-    pixel_size = model.constants['nm_per_pixel']
+    pixel_size = model.constants.nm_per_pixel
     
     pattern = np.zeros((height, width))
     line_width = int(target_cd_nm / pixel_size)
@@ -66,11 +66,9 @@ def test_ler_at_32nm_hp():
     for x in range(0, width, pitch):
         pattern[:, x:x+line_width] = 1.0
     
-    # Run Monte Carlo simulation (100 runs for statistics)
-    lers = []
-    for _ in range(100):
-        results = model.run_full_simulation(pattern, target_cd_nm=16.0)
-        lers.append(results['metrics']['ler_nm'])
+    # Run Monte Carlo simulation (100 realizations for statistics)
+    results = model.run_full_simulation(pattern, target_cd_nm=16.0, n_realizations=100)
+    lers = results['realization_metrics']['ler_nm']
     
     avg_ler = np.mean(lers)
     std_ler = np.std(lers)
@@ -82,7 +80,7 @@ def test_ler_at_32nm_hp():
 def test_process_window():
     """Validate process window against IMEC data"""
     model = EUVExposureModel()
-    model.tool['dose_mJ_cm2'] = 30.0
+    model.tool.dose_mJ_cm2 = 30.0
     
     # Calculate process window for 32nm HP
     pw = model.calculate_process_window(target_cd_nm=16.0, steps=15)
@@ -98,12 +96,12 @@ def test_process_window():
 def test_stochastic_defect_density():
     """Validate stochastic defect density model"""
     model = EUVExposureModel()
-    model.tool['dose_mJ_cm2'] = 25.0  # Lower dose = more defects
+    model.tool.dose_mJ_cm2 = 25.0  # Lower dose = more defects
     
     # Create dense pattern
     height, width = 1000, 1000
     target_cd_nm = 16.0
-    pixel_size = model.constants['nm_per_pixel']
+    pixel_size = model.constants.nm_per_pixel
     
     pattern = np.zeros((height, width))
     line_width = int(target_cd_nm / pixel_size)
@@ -118,3 +116,145 @@ def test_stochastic_defect_density():
     defect_density = results['metrics']['stochastic_defects_per_um2']
     assert 0.4 < defect_density < 1.2
     print(f"PASS: Simulated defect density = {defect_density:.2f} defects/um² (expected 0.5-1.0)")
+
+def test_ler_edge_detection():
+    """Validate per-row edge extraction used for LER and CD"""
+    model = EUVExposureModel()
+    pixel_size = model.constants.nm_per_pixel
+    
+    # Two lines per row; the first line's left edge alternates by one pixel
+    pattern = np.zeros((50, 100))
+    for y in range(50):
+        pattern[y, 20 + y % 2:52] = 1.0
+        pattern[y, 70:80] = 1.0
+    
+    metrics = model.calculate_stochastic_metrics(pattern, target_cd_nm=16.0)
+    
+    # Edge alternates between two columns: std = 0.5 px; widths 32 and 31 px
+    assert abs(metrics['ler_nm'] - 0.5 * pixel_size) < 1e-6
+    assert abs(metrics['cd_error_nm'] - (31.5 * pixel_size - 16.0)) < 1e-6
+
+def test_seeded_simulation_is_reproducible():
+    """Validate that a fixed seed reproduces the stochastic simulation"""
+    pattern = np.zeros((100, 100))
+    pattern[:, 30:62] = 1.0
+    
+    first = EUVExposureModel(seed=7).run_full_simulation(pattern, target_cd_nm=16.0)
+    second = EUVExposureModel(seed=7).run_full_simulation(pattern, target_cd_nm=16.0)
+    
+    assert np.array_equal(first['photon_map'], second['photon_map'])
+    assert np.array_equal(first['final_pattern'], second['final_pattern'])
+
+def test_realization_batches():
+    """Validate batched realizations: metrics for all, maps for the first batch"""
+    pattern = np.zeros((100, 100))
+    pattern[:, 30:62] = 1.0
+    model = EUVExposureModel(seed=3)
+    
+    results = model.run_full_simulation(pattern, target_cd_nm=16.0, n_realizations=5, batch_size=2)
+    
+    assert len(results['realization_metrics']['ler_nm']) == 5
+    assert results['map_realizations'] == 2
+    assert results['final_pattern'].shape == (2, 100, 100)
+    with pytest.raises(ValueError):
+        model.run_full_simulation(pattern, target_cd_nm=16.0, n_realizations=0)
+
+def test_tiled_simulation_matches_untiled():
+    """Validate that tiled execution reproduces the whole-image simulation"""
+    pattern = np.zeros((300, 300))
+    pattern[:, 150:] = 1.0
+    
+    # 80 mJ/cm² keeps the cascade in the (deterministic) blur regime; weak
+    # amplification and a fast developer put the developed edge mid-image
+    resist = {'chemical_amplification_factor': 0.014, 'development_rate_base_nm_s': 2.0}
+    untiled = EUVExposureModel(resist_parameters=resist, seed=11).run_full_simulation(
+        pattern, target_cd_nm=16.0, dose_mJ_cm2=80.0)
+    tiled = EUVExposureModel(resist_parameters=resist, seed=11).run_full_simulation(
+        pattern, target_cd_nm=16.0, dose_mJ_cm2=80.0, tile_size=64)
+    
+    # Away from the image border (one halo of 80 px) every stage agrees
+    interior = (slice(80, -80), slice(80, -80))
+    developed = untiled['final_pattern'][interior]
+    assert 0.2 < developed.mean() < 0.8
+    assert np.array_equal(tiled['final_pattern'][interior], developed)
+    for key in ('electron_map', 'diffused_acid', 'rate_map'):
+        np.testing.assert_allclose(tiled[key][interior], untiled[key][interior], rtol=1e-5)
+
+def test_scatter_electrons_numba_matches_numpy(monkeypatch):
+    """Validate the JIT electron scatter kernel against the NumPy path"""
+    pytest.importorskip('numba')
+    from models.euv_exposure import _scatter_electrons_numba
+    # Without the kernel the model takes the NumPy path on any thread count
+    monkeypatch.setattr('models.euv_exposure._scatter_electrons_numba', None)
+    
+    # Point source far from the border so every electron lands on the map
+    counts = np.zeros((101, 101), dtype=np.int64)
+    counts[50, 50] = 20000
+    sigma = 5.0
+    
+    jit_map = _scatter_electrons_numba(counts, sigma, 3, 4)
+    assert np.array_equal(jit_map, _scatter_electrons_numba(counts, sigma, 3, 4))
+    numpy_map = EUVExposureModel(seed=3)._scatter_electrons(counts, sigma)
+    
+    # Same electron count and the same lateral spread (within sampling error)
+    assert jit_map.sum() == numpy_map.sum() == counts.sum()
+    offsets = np.arange(101) - 50
+    def spread(scatter_map, axis):
+        profile = scatter_map.sum(axis=axis)
+        return np.sqrt(np.sum(profile * offsets**2) / profile.sum())
+    for axis in (0, 1):
+        assert abs(spread(jit_map, axis) - spread(numpy_map, axis)) < 0.05 * sigma
+
+def test_development_rate_numba_matches_numpy(monkeypatch):
+    """Validate the JIT development-rate kernel against the NumPy path"""
+    numba = pytest.importorskip('numba')
+    import models.euv_exposure as euv_exposure
+    
+    model = EUVExposureModel()
+    base = model.resist.development_rate_base_nm_s
+    contrast = model.resist.development_contrast
+    acid = np.random.default_rng(5).random((64, 64), dtype=np.float32)
+    expected = base / (1 + np.exp(-contrast * (acid.astype(np.float64) - 0.5)))
+    
+    jit_rate = np.empty_like(acid)
+    euv_exposure._development_rate_numba(acid.ravel(), base, contrast, jit_rate.reshape(-1))
+    np.testing.assert_allclose(jit_rate, expected, rtol=1e-6)
+    
+    # Kernel branch of the model (dispatched only with several threads)
+    with monkeypatch.context() as patch:
+        patch.setattr(numba, 'get_num_threads', lambda: 2)
+        np.testing.assert_allclose(model.calculate_development_rate(acid), expected, rtol=1e-6)
+    
+    # NumPy in-place branch
+    with monkeypatch.context() as patch:
+        patch.setattr(euv_exposure, '_development_rate_numba', None)
+        np.testing.assert_allclose(model.calculate_development_rate(acid), expected, rtol=1e-6)
+
+def test_process_window_independent_of_n_jobs():
+    """Validate that a seeded process window does not depend on the worker count"""
+    pytest.importorskip('joblib')
+    # Weak amplification and a fast developer give real edges, so LER is non-trivial
+    resist = {'chemical_amplification_factor': 0.1, 'development_rate_base_nm_s': 2.0}
+    
+    serial = EUVExposureModel(resist_parameters=resist, seed=5).calculate_process_window(
+        16.0, steps=4, n_jobs=1, grid_size=128)
+    parallel = EUVExposureModel(resist_parameters=resist, seed=5).calculate_process_window(
+        16.0, steps=4, n_jobs=2, grid_size=128)
+    
+    assert np.any(np.array(serial['lers']) > 0)
+    assert serial['lers'] == parallel['lers']
+
+def test_recursive_gaussian_matches_gaussian_filter():
+    """Validate the recursive Gaussian against scipy, borders included"""
+    from scipy.ndimage import gaussian_filter
+    from models.euv_exposure import _recursive_gaussian_2d
+    
+    # Line pattern that is bright at the right border
+    pattern = np.zeros((300, 300), dtype=np.float32)
+    for x in range(0, 300, 64):
+        pattern[:, x:x+32] = 1.0
+    pattern[:, 290:] = 1.0
+    
+    for sigma in (10.4, 30.0):
+        expected = gaussian_filter(pattern.astype(np.float64), sigma, mode='nearest')
+        np.testing.assert_allclose(_recursive_gaussian_2d(pattern, sigma), expected, atol=0.02)